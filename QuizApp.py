@@ -7,31 +7,151 @@ CLI Quiz Application using Open Trivia DB (https://opentdb.com)
 """
 
 import random
+import re
 import html
 import sys
+import os
+import json
+import time
 import difflib
-from typing import List, Dict, Optional
+import functools
+import importlib.util
+import threading
+import tempfile
+from concurrent.futures import Future
+from typing import List, Dict, Optional, Tuple
 try:
-    import requests
+    from rapidfuzz import process, fuzz
 except ImportError:
-    print("The 'requests' package is required. Install it with:\n  pip install requests")
-    sys.exit(1)
+    # Optional speedup; fall back to difflib below
+    process = fuzz = None
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
 
 
 OTDB_CATEGORIES_URL = "https://opentdb.com/api_category.php"
 OTDB_API_URL = "https://opentdb.com/api.php"
+OTDB_TOKEN_URL = "https://opentdb.com/api_token.php"
+DIFFICULTIES = frozenset({"easy", "medium", "hard"})
+QTYPES = frozenset({"multiple", "boolean"})
+# Minimum rapidfuzz WRatio score (0-100) for a topic to match a category. Real
+# matches score 85+; short partial overlaps ("tv" -> "Art") land around 60.
+MATCH_SCORE_CUTOFF = 85
+CATEGORIES_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "quizapp", "categories.json")
+CATEGORIES_CACHE_TTL = 7 * 24 * 60 * 60  # seconds; OTDB categories rarely change
 
-def fetch_categories() -> List[Dict]:
-    """Fetch available categories from Open Trivia DB."""
+# Shared session so all API calls reuse one keep-alive connection.
+# requests is imported on first use; main() checks it is installed up front.
+_requests = None
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_CATEGORIES: Optional[List[Dict]] = None
+_TOKEN: Optional[str] = None  # None: not requested yet; "": unavailable, don't ask again
+_INT_RE = re.compile(r"\A-?\d+\Z")
+
+def _get_requests():
+    """Import requests on first use; raises ImportError if it isn't installed."""
+    global _requests
+    if _requests is None:
+        import requests
+        _requests = requests
+    return _requests
+
+def _get_session():
+    """Return the shared requests.Session, creating it on first use."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = _get_requests().Session()
+    return _SESSION
+
+def _read_categories_cache() -> Optional[List[Dict]]:
+    """Return cached categories if the cache file exists and is fresh."""
     try:
-        resp = requests.get(OTDB_CATEGORIES_URL, timeout=10)
+        if time.time() - os.path.getmtime(CATEGORIES_CACHE_PATH) > CATEGORIES_CACHE_TTL:
+            return None
+        with open(CATEGORIES_CACHE_PATH, "rb") as f:
+            data = _loads(f.read())
+    except (OSError, ValueError):
+        return None
+    # Anything that doesn't look like OTDB's category list is treated as a miss
+    if not isinstance(data, list) or not all(
+            isinstance(c, dict) and isinstance(c.get("name"), str) and "id" in c for c in data):
+        return None
+    return data
+
+def _write_categories_cache(categories: List[Dict]):
+    """Write categories to the cache file atomically (best effort)."""
+    cache_dir = os.path.dirname(CATEGORIES_CACHE_PATH)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Unique temp file per writer, so concurrent runs can't interleave writes
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=cache_dir,
+                                         suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            json.dump(categories, f)
+        os.replace(tmp_path, CATEGORIES_CACHE_PATH)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+def _load_categories() -> List[Dict]:
+    """Load categories from the disk cache or the API; network errors propagate."""
+    global _CATEGORIES
+    if _CATEGORIES is not None:
+        return _CATEGORIES
+    categories = _read_categories_cache()
+    if not categories:
+        resp = _get_session().get(OTDB_CATEGORIES_URL, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
-        return data.get("trivia_categories", [])
+        data = _loads(resp.content)
+        categories = data.get("trivia_categories", [])
+        if categories:
+            _write_categories_cache(categories)
+    # Lowercase names once here; match_category still accepts plain {id, name} dicts
+    for c in categories:
+        c["_name_lower"] = c["name"].lower()
+    if categories:
+        # Only successful loads are kept, so a failed fetch is retried next call
+        _CATEGORIES = categories
+    return categories
+
+def fetch_categories() -> List[Dict]:
+    """Fetch available categories from Open Trivia DB (cached on disk for a week)."""
+    try:
+        return _load_categories()
     except Exception as e:
         print(f"⚠ Could not fetch categories: {e}")
         return []
 
+@functools.lru_cache(maxsize=128)
+def _match_index(topic: str, names: Tuple[str, ...], lower_names: Tuple[str, ...]) -> Optional[int]:
+    """Memoized core of match_category; returns the best category's index or None."""
+    topic_lower = topic.lower()
+    if process is not None:
+        # WRatio already covers partial/keyword containment
+        best = process.extractOne(topic_lower, lower_names, scorer=fuzz.WRatio,
+                                  score_cutoff=MATCH_SCORE_CUTOFF)
+        return best[2] if best else None
+
+    # Try strong match first
+    best = difflib.get_close_matches(topic, names, n=1, cutoff=0.6)
+    if best:
+        return names.index(best[0])
+
+    # Weak keyword containment as a backup
+    for i, name_lower in enumerate(lower_names):
+        if topic_lower in name_lower:
+            return i
+    return None
+
 def match_category(topic: str, categories: List[Dict]) -> Optional[Dict]:
     """
     Fuzzy-match the user's topic to the closest category.
@@ -40,21 +160,52 @@ def match_category(topic: str, categories: List[Dict]) -> Optional[Dict]:
     if not categories or not topic.strip():
         return None
 
-    names = [c["name"] for c in categories]
-    # Try strong match first
-    best = difflib.get_close_matches(topic, names, n=1, cutoff=0.6)
-    if best:
-        name = best[0]
-        for c in categories:
-            if c["name"] == name:
-                return c
+    idx = _match_index(topic, tuple(c["name"] for c in categories),
+                       tuple(c.get("_name_lower") or c["name"].lower() for c in categories))
+    return categories[idx] if idx is not None else None
 
-    # Weak keyword containment as a backup
-    topic_lower = topic.lower()
-    partials = [c for c in categories if topic_lower in c["name"].lower()]
-    if partials:
-        return partials[0]
-    return None
+def match_categories(topics: List[str], categories: List[Dict]) -> List[Optional[Dict]]:
+    """
+    Batch version of match_category for matching many topics at once.
+    Returns one matched category dict (or None) per topic.
+    """
+    if process is None or not categories:
+        return [match_category(t, categories) for t in topics]
+
+    # Score every topic against every name in one call, then pick each row's best
+    lower_names = [c.get("_name_lower") or c["name"].lower() for c in categories]
+    try:
+        scores = process.cdist([t.lower() for t in topics], lower_names,
+                               scorer=fuzz.WRatio, score_cutoff=MATCH_SCORE_CUTOFF)
+    except ImportError:
+        # cdist returns a numpy array, and rapidfuzz doesn't install numpy
+        return [match_category(t, categories) for t in topics]
+    results = []
+    for topic, row in zip(topics, scores):
+        best = int(row.argmax())
+        results.append(categories[best] if topic.strip() and row[best] >= MATCH_SCORE_CUTOFF else None)
+    return results
+
+def _load_token() -> Optional[str]:
+    """Request an OTDB session token if we don't have one; network errors propagate."""
+    global _TOKEN
+    if _TOKEN is None:
+        # Mark as tried first so a failed request isn't repeated on every fetch
+        _TOKEN = ""
+        resp = _get_session().get(OTDB_TOKEN_URL, params={"command": "request"}, timeout=10)
+        resp.raise_for_status()
+        data = _loads(resp.content)
+        if data.get("response_code") == 0:
+            _TOKEN = data.get("token") or ""
+    return _TOKEN or None
+
+def fetch_token() -> Optional[str]:
+    """Request an OTDB session token once; it stops the API repeating questions."""
+    try:
+        return _load_token()
+    except Exception as e:
+        print(f"⚠ Could not fetch session token: {e}")
+        return None
 
 def fetch_questions(amount: int = 10,
                     category_id: Optional[int] = None,
@@ -65,34 +216,70 @@ def fetch_questions(amount: int = 10,
     - difficulty: "easy", "medium", "hard", or None
     - qtype: "multiple", "boolean", or None
     """
+    global _TOKEN
     params = {"amount": max(1, min(amount, 50))}  # OTDB max is 50
     if category_id:
         params["category"] = category_id
-    if difficulty and difficulty.lower() in {"easy", "medium", "hard"}:
+    if difficulty and difficulty.lower() in DIFFICULTIES:
         params["difficulty"] = difficulty.lower()
-    if qtype and qtype.lower() in {"multiple", "boolean"}:
+    if qtype and qtype.lower() in QTYPES:
         params["type"] = qtype.lower()
+    token = fetch_token()
+    if token:
+        params["token"] = token
 
     try:
-        resp = requests.get(OTDB_API_URL, params=params, timeout=15)
+        resp = _get_session().get(OTDB_API_URL, params=params, timeout=15)
         resp.raise_for_status()
-        data = resp.json()
+        data = _loads(resp.content)
         response_code = data.get("response_code", 1)
         if response_code != 0:
             # 1: No Results, 2: Invalid Parameter, 3: Token Not Found, 4: Token Empty
+            if response_code in (3, 4) and "token" in params:
+                # The token is bad, not the query: drop it and retry the same query once
+                _TOKEN = ""
+                return fetch_questions(amount, category_id, difficulty, qtype)
             return []
         return data.get("results", [])
     except Exception as e:
         print(f"⚠ Could not fetch questions: {e}")
         return []
 
+# Entities OTDB emits most often. "&amp;" is deliberately absent: it is only
+# replaced once nothing else is left, so "&amp;lt;" isn't decoded twice.
+_COMMON_ENTITIES = [
+    ("&quot;", '"'), ("&#039;", "'"), ("&lt;", "<"), ("&gt;", ">"),
+    ("&eacute;", "é"), ("&Eacute;", "É"), ("&aacute;", "á"), ("&iacute;", "í"),
+    ("&oacute;", "ó"), ("&uacute;", "ú"), ("&ntilde;", "ñ"), ("&ouml;", "ö"),
+    ("&uuml;", "ü"), ("&auml;", "ä"), ("&rsquo;", "’"), ("&ldquo;", "“"),
+    ("&rdquo;", "”"), ("&hellip;", "…"), ("&shy;", "\u00ad"),
+]
+
+def _unescape(s: str) -> str:
+    """Decode HTML entities, using plain str.replace for the common ones."""
+    if "&" not in s:
+        return s
+    for entity, char in _COMMON_ENTITIES:
+        s = s.replace(entity, char)
+    if "&" not in s:
+        return s
+    if s.count("&") == s.count("&amp;"):
+        return s.replace("&amp;", "&")
+    return html.unescape(s)
+
 def normalize_question(q: Dict) -> Dict:
     """Convert API question to our internal structure and decode HTML entities."""
-    question_text = html.unescape(q.get("question", ""))
-    correct = html.unescape(q.get("correct_answer", ""))
-    incorrect = [html.unescape(x) for x in q.get("incorrect_answers", [])]
-    all_options = incorrect + [correct]
-    random.shuffle(all_options)
+    question_text = _unescape(q.get("question", ""))
+    correct = _unescape(q.get("correct_answer", ""))
+    incorrect = q.get("incorrect_answers", [])
+    if q.get("type") == "boolean" and len(incorrect) == 1:
+        # Two options: a coin flip decides the order
+        wrong = _unescape(incorrect[0])
+        all_options = [correct, wrong] if random.getrandbits(1) else [wrong, correct]
+    else:
+        all_options = [_unescape(x) for x in incorrect]
+        all_options.append(correct)
+        random.shuffle(all_options)
     return {
         "question": question_text,
         "options": all_options,
@@ -108,13 +295,13 @@ def prompt_int(msg: str, default: int, lo: int, hi: int) -> int:
         raw = input(f"{msg} [{default}]: ").strip()
         if not raw:
             return default
-        try:
-            val = int(raw)
-            if lo <= val <= hi:
-                return val
-            print(f"Enter a number between {lo} and {hi}.")
-        except ValueError:
+        if not _INT_RE.match(raw):
             print("Enter a valid integer.")
+            continue
+        val = int(raw)
+        if lo <= val <= hi:
+            return val
+        print(f"Enter a number between {lo} and {hi}.")
 
 def prompt_choice(msg: str, choices: List[str], default: str) -> str:
     """Prompt for a choice (case-insensitive)."""
@@ -132,21 +319,22 @@ def run_quiz(questions: List[Dict]):
     score = 0
     print("\n🔹 Starting Quiz! Good luck!\n")
     for idx, q in enumerate(questions, start=1):
-        print(f"Q{idx} ({q.get('category', 'General')} - {q.get('difficulty', 'unknown').title()}):")
-        print(q["question"])
+        block = [f"Q{idx} ({q['category']} - {q['difficulty'].title()}):", q["question"]]
 
         # True/False questions sometimes come with only 2 options; ensure numbered menu
-        for i, option in enumerate(q["options"], start=1):
-            print(f"  {i}. {option}")
+        block.extend(f"  {i}. {option}" for i, option in enumerate(q["options"], start=1))
+        # One write for the whole question block
+        print("\n".join(block))
 
         while True:
-            try:
-                ans = int(input("Your answer (enter option number): "))
-                if 1 <= ans <= len(q["options"]):
-                    break
-                print(f"Enter a number between 1 and {len(q['options'])}.")
-            except ValueError:
+            raw = input("Your answer (enter option number): ").strip()
+            if not _INT_RE.match(raw):
                 print("Please enter a valid number.")
+                continue
+            ans = int(raw)
+            if 1 <= ans <= len(q["options"]):
+                break
+            print(f"Enter a number between 1 and {len(q['options'])}.")
 
         chosen = q["options"][ans - 1]
         if chosen == q["answer"]:
@@ -167,16 +355,46 @@ def run_quiz(questions: List[Dict]):
     else:
         print("📚 Keep learning—you’ll improve fast!")
 
+def _run_in_background(fn) -> Future:
+    """
+    Run fn in a daemon thread and return a Future for its result.
+    Daemon threads don't hold up exit if the user hits Ctrl-C mid-request.
+    """
+    future = Future()
+
+    def worker():
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=worker, daemon=True).start()
+    return future
+
 def main():
+    # Check without importing; the import itself happens in the background fetches
+    if importlib.util.find_spec("requests") is None:
+        print("The 'requests' package is required. Install it with:\n  pip install requests")
+        sys.exit(1)
+
     print("\n====== Any-Topic Quiz (Open Trivia DB) ======\n")
+    # Fetch categories and a session token in the background while the user answers the prompts.
+    # Errors are reported below, after the prompts, so they don't land mid-input.
+    categories_future = _run_in_background(_load_categories)
+    token_future = _run_in_background(_load_token)
+
     topic = input("Enter a topic (e.g., 'history', 'science', 'sports', or leave blank for random): ").strip()
 
     amount = prompt_int("How many questions? (1–50)", default=10, lo=1, hi=50)
     difficulty = prompt_choice("Difficulty?", ["any", "easy", "medium", "hard"], default="any")
     qtype = prompt_choice("Type?", ["any", "multiple", "boolean"], default="any")
 
-    # Fetch categories and match
-    categories = fetch_categories()
+    # Match topic against the prefetched categories
+    try:
+        categories = categories_future.result()
+    except Exception as e:
+        print(f"⚠ Could not fetch categories: {e}")
+        categories = []
     matched = match_category(topic, categories) if topic else None
     if matched:
         print(f"🔎 Matched topic to category: {matched['name']} (id {matched['id']})")
@@ -187,6 +405,10 @@ def main():
             print("ℹ Random topic selected.")
 
     # Fetch questions
+    try:
+        token_future.result()
+    except Exception as e:
+        print(f"⚠ Could not fetch session token: {e}")
     cat_id = matched["id"] if matched else None
     cat_questions = fetch_questions(amount=amount,
                                     category_id=cat_id,
@@ -0,0 +1,88 @@
+import unittest
+
+import QuizApp
+
+# Category list as returned by https://opentdb.com/api_category.php
+CATEGORIES = [
+    {"id": 9, "name": "General Knowledge"},
+    {"id": 10, "name": "Entertainment: Books"},
+    {"id": 11, "name": "Entertainment: Film"},
+    {"id": 12, "name": "Entertainment: Music"},
+    {"id": 13, "name": "Entertainment: Musicals & Theatres"},
+    {"id": 14, "name": "Entertainment: Television"},
+    {"id": 15, "name": "Entertainment: Video Games"},
+    {"id": 16, "name": "Entertainment: Board Games"},
+    {"id": 17, "name": "Science & Nature"},
+    {"id": 18, "name": "Science: Computers"},
+    {"id": 19, "name": "Science: Mathematics"},
+    {"id": 20, "name": "Mythology"},
+    {"id": 21, "name": "Sports"},
+    {"id": 22, "name": "Geography"},
+    {"id": 23, "name": "History"},
+    {"id": 24, "name": "Politics"},
+    {"id": 25, "name": "Art"},
+    {"id": 26, "name": "Celebrities"},
+    {"id": 27, "name": "Animals"},
+    {"id": 28, "name": "Vehicles"},
+    {"id": 29, "name": "Entertainment: Comics"},
+    {"id": 30, "name": "Science: Gadgets"},
+    {"id": 31, "name": "Entertainment: Japanese Anime & Manga"},
+    {"id": 32, "name": "Entertainment: Cartoon & Animations"},
+]
+
+# Topic -> expected category id (None: no match, the quiz uses random categories)
+EXPECTED = {
+    "history": 23,
+    "Histroy": 23,
+    "sport": 21,
+    "science": 17,
+    "math": 19,
+    "music": 12,
+    "computers": 18,
+    "film": 11,
+    "anime": 31,
+    "harry potter": None,
+    "tv": None,
+    "cars": None,
+    "movies": None,
+    "xyzzy": None,
+    "": None,
+    "   ": None,
+}
+
+
+def category_id(category):
+    return category["id"] if category else None
+
+
+class MatchCategoryTest(unittest.TestCase):
+    def test_expected_matches(self):
+        for topic, expected in EXPECTED.items():
+            with self.subTest(topic=topic):
+                self.assertEqual(category_id(QuizApp.match_category(topic, CATEGORIES)), expected)
+
+    def test_no_categories(self):
+        self.assertIsNone(QuizApp.match_category("history", []))
+
+    def test_duplicate_names_match_first(self):
+        categories = [{"id": 1, "name": "History"}, {"id": 2, "name": "History"}]
+        self.assertEqual(category_id(QuizApp.match_category("Histroy", categories)), 1)
+
+
+class MatchCategoriesTest(unittest.TestCase):
+    def test_expected_matches(self):
+        topics = list(EXPECTED)
+        matched = QuizApp.match_categories(topics, CATEGORIES)
+        self.assertEqual([category_id(c) for c in matched], list(EXPECTED.values()))
+
+    def test_expected_matches_with_precomputed_lowercase_names(self):
+        categories = [dict(c, _name_lower=c["name"].lower()) for c in CATEGORIES]
+        matched = QuizApp.match_categories(list(EXPECTED), categories)
+        self.assertEqual([category_id(c) for c in matched], list(EXPECTED.values()))
+
+    def test_no_categories(self):
+        self.assertEqual(QuizApp.match_categories(["history"], []), [None])
+
+
+if __name__ == "__main__":
+    unittest.main()